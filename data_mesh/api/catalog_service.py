@@ -1,13 +1,25 @@
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
+import orjson
 
 from ..catalog.catalog import DataCatalog, DataProduct, DataProductVersion
+from ..health import cached_now_iso
 
-app = FastAPI(title="Data Catalog Service")
+app = FastAPI(title="Data Catalog Service", default_response_class=ORJSONResponse)
 catalog = DataCatalog()
 
+def _stream_json_array(items: Iterable[bytes]) -> StreamingResponse:
+    """Stream pre-serialized JSON items as a JSON array."""
+    async def body() -> AsyncIterator[bytes]:
+        separator = b"["
+        for item in items:
+            yield separator + item
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+    return StreamingResponse(body(), media_type="application/json")
+
 class ProductRequest(BaseModel):
     """Request model for registering/updating a data product."""
     name: str
@@ -15,7 +27,7 @@ class ProductRequest(BaseModel):
     domain: str
     owner: str
     version: str
-    schema: Dict[str, any]
+    schema: Dict[str, Any]
     quality_rules: List[str] = []
     policies: List[str] = []
     tags: List[str] = []
@@ -24,7 +36,7 @@ class VersionRequest(BaseModel):
     """Request model for adding a new version."""
     product_name: str
     version: str
-    schema: Dict[str, any]
+    schema: Dict[str, Any]
     created_by: str
     change_description: str
 
@@ -32,7 +44,7 @@ class VersionRequest(BaseModel):
 async def register_product(product: ProductRequest):
     """Register a new data product."""
     try:
-        data_product = DataProduct(**product.dict())
+        data_product = DataProduct.model_construct(**product.__dict__)
         catalog.register_product(data_product)
         return data_product
     except Exception as e:
@@ -42,9 +54,8 @@ async def register_product(product: ProductRequest):
 async def update_product(name: str, product: ProductRequest):
     """Update an existing data product."""
     try:
-        data_product = DataProduct(**product.dict())
-        catalog.update_product(data_product)
-        return data_product
+        data_product = DataProduct.model_construct(**product.__dict__)
+        return catalog.update_product(data_product)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -61,13 +72,14 @@ async def get_product(name: str):
 @app.get("/products", response_model=List[DataProduct])
 async def list_products(domain: Optional[str] = None):
     """List all data products, optionally filtered by domain."""
-    return catalog.list_products(domain)
+    products = catalog.list_products(domain)
+    return _stream_json_array(catalog.get_product_json(p) for p in products)
 
 @app.post("/products/{name}/versions", response_model=DataProductVersion)
 async def add_version(name: str, version: VersionRequest):
     """Add a new version of a data product."""
     try:
-        data_version = DataProductVersion(**version.dict())
+        data_version = DataProductVersion.model_construct(**version.__dict__)
         catalog.add_version(data_version)
         return data_version
     except ValueError as e:
@@ -81,12 +93,13 @@ async def get_versions(name: str):
     versions = catalog.get_versions(name)
     if not versions:
         raise HTTPException(status_code=404, detail=f"No versions found for product {name}")
-    return versions
+    return _stream_json_array(orjson.dumps(v.model_dump()) for v in versions)
 
 @app.get("/search", response_model=List[DataProduct])
 async def search_products(query: str = Query(..., min_length=1)):
     """Search for data products."""
-    return catalog.search_products(query)
+    products = catalog.search_products(query)
+    return _stream_json_array(catalog.get_product_json(p) for p in products)
 
 @app.get("/products/{name}/lineage")
 async def get_product_lineage(name: str):
@@ -107,4 +120,4 @@ async def get_product_quality(name: str):
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()} 
\ No newline at end of file
+    return {"status": "healthy", "timestamp": cached_now_iso()} 
\ No newline at end of file
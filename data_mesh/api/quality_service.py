@@ -1,12 +1,16 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import FastAPI, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from datetime import datetime
+import numpy as np
+import pandas as pd
 
 from ..quality.engine import QualityRule, QualityResult
 from ..quality.monitor import QualityMonitor
+from ..health import cached_now_iso
 
-app = FastAPI(title="Data Quality Service")
+app = FastAPI(title="Data Quality Service", default_response_class=ORJSONResponse)
 monitor = QualityMonitor()
 
 class RuleRequest(BaseModel):
@@ -14,15 +18,28 @@ class RuleRequest(BaseModel):
     name: str
     description: str
     rule_type: str
-    parameters: Dict[str, any]
+    parameters: Dict[str, Any]
     severity: str
     enabled: bool = True
 
 class QualityCheckRequest(BaseModel):
     """Request model for quality check."""
-    data: Dict[str, any]
+    data: Dict[str, Any]
     domain: str
 
+class BatchCheckRequest(BaseModel):
+    """Request model for a columnar batch quality check."""
+    data: Dict[str, List[Any]]
+    domain: str
+
+class BatchCheckResult(BaseModel):
+    """Response model for one rule applied to one column."""
+    column: str
+    rule_name: str
+    total: int
+    failed: int
+    failed_indices: List[int]
+
 class QualityReport(BaseModel):
     """Response model for quality report."""
     domain: str
@@ -35,7 +52,7 @@ class QualityReport(BaseModel):
 async def add_rule(rule: RuleRequest):
     """Add a new quality rule."""
     try:
-        quality_rule = QualityRule(**rule.dict())
+        quality_rule = QualityRule.model_construct(**rule.__dict__)
         monitor.add_quality_rule(quality_rule)
         return quality_rule
     except Exception as e:
@@ -46,6 +63,28 @@ async def check_quality(request: QualityCheckRequest):
     """Perform quality checks on data."""
     try:
         results = monitor.check_quality(request.data, request.domain)
+        return [result.to_model(QualityResult) for result in results]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/check/batch", response_model=List[BatchCheckResult])
+async def check_quality_batch(request: BatchCheckRequest):
+    """Perform vectorized quality checks on columnar data."""
+    try:
+        results = []
+        for column, values in request.data.items():
+            # pandas keeps mixed columns as objects instead of stringifying them
+            arr = pd.Series(values).to_numpy()
+            for rule in monitor.rules_for_field(column):
+                passed = monitor.engine.validate_batch(rule, arr)
+                failed_indices = np.flatnonzero(~passed)
+                results.append(BatchCheckResult(
+                    column=column,
+                    rule_name=rule.name,
+                    total=len(arr),
+                    failed=len(failed_indices),
+                    failed_indices=failed_indices.tolist()
+                ))
         return results
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -62,4 +101,4 @@ async def get_quality_report(domain: str):
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()} 
\ No newline at end of file
+    return {"status": "healthy", "timestamp": cached_now_iso()} 
\ No newline at end of file
@@ -1,12 +1,31 @@
-from typing import Dict, List, Optional, Any
+from typing import ClassVar, Dict, FrozenSet, List, Optional, Any, Set, Tuple
+from collections import defaultdict
 from datetime import datetime
 import logging
-from pydantic import BaseModel, Field
+import threading
+import time
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, SerializerFunctionWrapHandler, model_serializer
 
 logger = logging.getLogger(__name__)
 
+# Length of the character n-grams indexed for substring search
+_GRAM = 3
+
+def _grams(text: str) -> Set[str]:
+    """Split lowercase text into its set of overlapping character trigrams."""
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
 class DataProduct(BaseModel):
-    """Represents a data product in the catalog."""
+    """
+    Represents a data product in the catalog.
+    
+    Products are immutable; use model_copy(update=...) to derive a changed
+    product. model_construct may only be used on data that has already been
+    validated, such as a parsed API request model.
+    """
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     name: str
     description: str
     domain: str
@@ -19,6 +38,17 @@ class DataProduct(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
     tags: List[str] = []
     status: str = "active"
+    
+    # List fields left out of dumps when they were never explicitly set
+    _optional_fields: ClassVar[FrozenSet[str]] = frozenset({"quality_rules", "policies", "tags"})
+    
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        """Dump the product, dropping optional list fields that were never set."""
+        data: Dict[str, Any] = handler(self)
+        for key in self._optional_fields - self.__pydantic_fields_set__:
+            data.pop(key, None)
+        return data
 
 class DataProductVersion(BaseModel):
     """Represents a version of a data product."""
@@ -30,19 +60,87 @@ class DataProductVersion(BaseModel):
     change_description: str
 
 class DataCatalog:
-    """Core catalog for managing data products and metadata."""
+    """
+    Core catalog for managing data products and metadata.
     
-    def __init__(self):
+    Writes are serialized by a lock. Reads take no lock and rely on single
+    dict/set operations being atomic, so they may run concurrently with a
+    write and observe either the state before or after it.
+    """
+    
+    def __init__(self, max_staleness: float = 60.0):
+        """
+        Initialize an empty catalog.
+        
+        Args:
+            max_staleness: Seconds a cached lineage or quality read may be
+                served before it is rebuilt, even if the product is unchanged
+        """
+        self._lock = threading.Lock()
+        self.max_staleness = max_staleness
         self.products: Dict[str, DataProduct] = {}
         self.versions: Dict[str, List[DataProductVersion]] = {}
-        self._setup_logging()
+        # Inverted index: trigram -> names of products whose name, description
+        # or a tag contains that trigram
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._doc_grams: Dict[str, Set[str]] = {}
+        # Registration order, so search results keep the catalog's order
+        self._seq: Dict[str, int] = {}
+        # Lowercased (name, description, tags) per product for substring search
+        self._lc: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        # Domain index: domain -> names of products in that domain
+        self._by_domain: Dict[str, Set[str]] = defaultdict(set)
+        # Read caches stamped with the product revision they were built from
+        # and the monotonic time they were built at
+        self._revisions: Dict[str, int] = {}
+        self._lineage_cache: Dict[str, Tuple[int, float, Dict[str, Any]]] = {}
+        self._quality_cache: Dict[str, Tuple[int, float, Dict[str, Any]]] = {}
+        # Pre-serialized JSON per product, dropped whenever the product changes
+        # and tagged with the product object it was encoded from
+        self._json_cache: Dict[str, Tuple[DataProduct, bytes]] = {}
     
-    def _setup_logging(self):
-        """Configure logging for the catalog."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+    def _index_product(self, product: DataProduct) -> None:
+        """
+        Update the search and domain indexes for a product, dropping stale
+        entries. Must be called before the product is stored in the catalog.
+        
+        Args:
+            product: The data product to index
+        """
+        previous = self.products.get(product.name)
+        if previous is not None and previous.domain != product.domain:
+            bucket = self._by_domain[previous.domain]
+            bucket.discard(product.name)
+            if not bucket:
+                del self._by_domain[previous.domain]
+        self._by_domain[product.domain].add(product.name)
+        
+        name_lc = product.name.lower()
+        desc_lc = product.description.lower()
+        tags_lc = tuple(tag.lower() for tag in product.tags)
+        # Grams are taken per field so none spans two fields
+        grams = _grams(name_lc) | _grams(desc_lc)
+        for tag in tags_lc:
+            grams |= _grams(tag)
+        
+        # Stored before the postings so a reader never finds a posting without it
+        self._lc[product.name] = (name_lc, desc_lc, tags_lc)
+        
+        old_grams = self._doc_grams.get(product.name, set())
+        for gram in old_grams - grams:
+            postings = self._postings[gram]
+            postings.discard(product.name)
+            if not postings:
+                del self._postings[gram]
+        for gram in grams - old_grams:
+            self._postings[gram].add(product.name)
+        self._doc_grams[product.name] = grams
+        self._seq.setdefault(product.name, len(self._seq))
+    
+    def _touch(self, product_name: str) -> None:
+        """Bump a product's revision so cached reads for it are rebuilt."""
+        self._revisions[product_name] = self._revisions.get(product_name, 0) + 1
+        self._json_cache.pop(product_name, None)
     
     def register_product(self, product: DataProduct) -> None:
         """
@@ -51,23 +149,36 @@ class DataCatalog:
         Args:
             product: The data product to register
         """
-        self.products[product.name] = product
-        self.versions[product.name] = []
+        with self._lock:
+            # Everything a reader looks up by name exists before the product is
+            # stored, and the revision is bumped after so caches are rebuilt
+            self.versions[product.name] = []
+            self._revisions.setdefault(product.name, 0)
+            self._index_product(product)
+            self.products[product.name] = product
+            self._touch(product.name)
         logger.info(f"Registered data product: {product.name}")
     
-    def update_product(self, product: DataProduct) -> None:
+    def update_product(self, product: DataProduct) -> DataProduct:
         """
         Update an existing data product.
         
         Args:
             product: The updated data product
+            
+        Returns:
+            The stored product, stamped with a new updated_at
         """
-        if product.name not in self.products:
-            raise ValueError(f"Product {product.name} not found")
-        
-        self.products[product.name] = product
-        product.updated_at = datetime.now()
+        with self._lock:
+            if product.name not in self.products:
+                raise ValueError(f"Product {product.name} not found")
+            
+            product = product.model_copy(update={"updated_at": datetime.now()})
+            self._index_product(product)
+            self.products[product.name] = product
+            self._touch(product.name)
         logger.info(f"Updated data product: {product.name}")
+        return product
     
     def get_product(self, name: str) -> Optional[DataProduct]:
         """
@@ -81,6 +192,30 @@ class DataCatalog:
         """
         return self.products.get(name)
     
+    def get_product_json(self, product: DataProduct) -> bytes:
+        """
+        Get the JSON encoding of a catalog product, serializing it at most once
+        per change.
+        
+        Only the encoding of the product currently stored under its name is
+        cached, so a stale object held by an in-flight read (e.g. a streamed
+        listing overtaken by an update) is encoded without polluting the cache.
+        
+        Args:
+            product: A data product stored in the catalog
+            
+        Returns:
+            The product encoded as JSON bytes
+        """
+        cached = self._json_cache.get(product.name)
+        if cached is not None and cached[0] is product:
+            return cached[1]
+        
+        data = orjson.dumps(product.model_dump())
+        if self.products.get(product.name) is product:
+            self._json_cache[product.name] = (product, data)
+        return data
+    
     def list_products(self, domain: Optional[str] = None) -> List[DataProduct]:
         """
         List all data products, optionally filtered by domain.
@@ -92,7 +227,11 @@ class DataCatalog:
             List of data products
         """
         if domain:
-            return [p for p in self.products.values() if p.domain == domain]
+            products = self.products
+            seq = self._seq
+            names = sorted(list(self._by_domain.get(domain, ())), key=lambda name: seq.get(name, 0))
+            # Indexed before it is stored, so a concurrent register may not have landed yet
+            return [product for product in map(products.get, names) if product is not None]
         return list(self.products.values())
     
     def add_version(self, version: DataProductVersion) -> None:
@@ -102,10 +241,12 @@ class DataCatalog:
         Args:
             version: The new version to add
         """
-        if version.product_name not in self.versions:
-            raise ValueError(f"Product {version.product_name} not found")
-        
-        self.versions[version.product_name].append(version)
+        with self._lock:
+            if version.product_name not in self.versions:
+                raise ValueError(f"Product {version.product_name} not found")
+            
+            self.versions[version.product_name].append(version)
+            self._touch(version.product_name)
         logger.info(f"Added version {version.version} for product {version.product_name}")
     
     def get_versions(self, product_name: str) -> List[DataProductVersion]:
@@ -124,24 +265,53 @@ class DataCatalog:
         """
         Search for data products by name, description, or tags.
         
+        Matches are case-insensitive substrings of a product's name,
+        description or one of its tags. Queries of three or more characters
+        only check the products that contain every trigram of the query;
+        shorter queries scan the whole catalog.
+        
         Args:
             query: Search query
             
         Returns:
             List of matching data products
         """
+        products = self.products
+        lc = self._lc
         query = query.lower()
-        return [
-            p for p in self.products.values()
-            if query in p.name.lower() or
-               query in p.description.lower() or
-               any(query in tag.lower() for tag in p.tags)
-        ]
+        
+        if len(query) < _GRAM:
+            # Snapshot the keys so a concurrent write cannot resize the dict mid-scan
+            candidates = list(lc)
+        else:
+            postings = self._postings
+            # .get() so a lookup never inserts into the defaultdict from a reader
+            posting_sets: List[Set[str]] = []
+            for gram in _grams(query):
+                names = postings.get(gram)
+                if not names:
+                    return []
+                posting_sets.append(names)
+            seq = self._seq
+            candidates = sorted(set.intersection(*posting_sets), key=lambda name: seq.get(name, 0))
+        
+        matches = []
+        for name in candidates:
+            name_lc, desc_lc, tags_lc = lc[name]
+            if query in name_lc or query in desc_lc or any(query in tag for tag in tags_lc):
+                # Indexed before it is stored, so a concurrent register may not have landed yet
+                product = products.get(name)
+                if product is not None:
+                    matches.append(product)
+        return matches
     
     def get_product_lineage(self, product_name: str) -> Dict[str, Any]:
         """
         Get the lineage information for a data product.
         
+        The result is cached until the product or its versions change, or
+        for at most max_staleness seconds, so callers must not mutate it.
+        
         Args:
             product_name: Name of the data product
             
@@ -151,18 +321,29 @@ class DataCatalog:
         if product_name not in self.products:
             raise ValueError(f"Product {product_name} not found")
         
+        revision = self._revisions[product_name]
+        now = time.monotonic()
+        cached = self._lineage_cache.get(product_name)
+        if cached is not None and cached[0] == revision and now - cached[1] < self.max_staleness:
+            return cached[2]
+        
         # In a real implementation, this would include actual lineage information
-        return {
+        lineage = {
             "product": product_name,
             "versions": [v.version for v in self.versions[product_name]],
             "dependencies": [],  # Would include actual dependencies
             "dependents": []     # Would include actual dependents
         }
+        self._lineage_cache[product_name] = (revision, now, lineage)
+        return lineage
     
     def get_product_quality(self, product_name: str) -> Dict[str, Any]:
         """
         Get quality information for a data product.
         
+        The result is cached until the product changes, or for at most
+        max_staleness seconds, so callers must not mutate it.
+        
         Args:
             product_name: Name of the data product
             
@@ -172,10 +353,18 @@ class DataCatalog:
         if product_name not in self.products:
             raise ValueError(f"Product {product_name} not found")
         
+        revision = self._revisions[product_name]
+        now = time.monotonic()
+        cached = self._quality_cache.get(product_name)
+        if cached is not None and cached[0] == revision and now - cached[1] < self.max_staleness:
+            return cached[2]
+        
         product = self.products[product_name]
-        return {
+        quality = {
             "product": product_name,
             "quality_rules": product.quality_rules,
             "policies": product.policies,
             "last_updated": product.updated_at.isoformat()
-        } 
\ No newline at end of file
+        }
+        self._quality_cache[product_name] = (revision, now, quality)
+        return quality 
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import logging
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +13,8 @@ class Policy(BaseModel):
     parameters: Dict[str, Any]
     domain: str
     enabled: bool = True
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
 
 class PolicyResult(BaseModel):
     """Represents the result of a policy check."""
@@ -29,14 +29,11 @@ class PolicyEngine:
     
     def __init__(self):
         self.policies: Dict[str, Policy] = {}
-        self._setup_logging()
-    
-    def _setup_logging(self):
-        """Configure logging for the policy engine."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        self._policy_dispatch: Dict[str, Callable[[Policy, Any], Tuple[bool, str]]] = {
+            "data_classification": self._policy_data_classification,
+            "access_control": self._policy_access_control,
+            "data_retention": self._policy_data_retention,
+        }
     
     def add_policy(self, policy: Policy) -> None:
         """Add a new policy to the engine."""
@@ -94,23 +91,10 @@ class PolicyEngine:
             Policy check result
         """
         try:
-            if policy.policy_type == "data_classification":
-                classification = policy.parameters.get("classification")
-                passed = self._check_data_classification(data, classification)
-                message = f"Data classification check {'passed' if passed else 'failed'}"
-            
-            elif policy.policy_type == "access_control":
-                required_roles = policy.parameters.get("required_roles", [])
-                passed = self._check_access_control(data, required_roles)
-                message = f"Access control check {'passed' if passed else 'failed'}"
-            
-            elif policy.policy_type == "data_retention":
-                retention_period = policy.parameters.get("retention_period")
-                passed = self._check_data_retention(data, retention_period)
-                message = f"Data retention check {'passed' if passed else 'failed'}"
-            
-            else:
+            handler = self._policy_dispatch.get(policy.policy_type)
+            if handler is None:
                 raise ValueError(f"Unknown policy type: {policy.policy_type}")
+            passed, message = handler(policy, data)
             
             return PolicyResult(
                 policy_name=policy.name,
@@ -123,6 +107,24 @@ class PolicyEngine:
             logger.error(f"Error in policy execution: {str(e)}")
             raise
     
+    def _policy_data_classification(self, policy: Policy, data: Any) -> Tuple[bool, str]:
+        """Run a data classification policy."""
+        classification = policy.parameters.get("classification")
+        passed = self._check_data_classification(data, classification)
+        return passed, f"Data classification check {'passed' if passed else 'failed'}"
+    
+    def _policy_access_control(self, policy: Policy, data: Any) -> Tuple[bool, str]:
+        """Run an access control policy."""
+        required_roles = policy.parameters.get("required_roles", [])
+        passed = self._check_access_control(data, required_roles)
+        return passed, f"Access control check {'passed' if passed else 'failed'}"
+    
+    def _policy_data_retention(self, policy: Policy, data: Any) -> Tuple[bool, str]:
+        """Run a data retention policy."""
+        retention_period = policy.parameters.get("retention_period")
+        passed = self._check_data_retention(data, retention_period)
+        return passed, f"Data retention check {'passed' if passed else 'failed'}"
+    
     def _check_data_classification(self, data: Any, classification: str) -> bool:
         """Check if data meets classification requirements."""
         # Implement classification check logic
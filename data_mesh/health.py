@@ -0,0 +1,15 @@
+from datetime import datetime
+import time
+
+# Monotonic time of the last refresh and the ISO timestamp formatted then
+_now_ts: float = float("-inf")
+_now_iso: str = ""
+
+def cached_now_iso() -> str:
+    """Get the current time as an ISO 8601 string, reformatted at most once per second."""
+    global _now_ts, _now_iso
+    now = time.monotonic()
+    if now - _now_ts > 1.0:
+        _now_iso = datetime.now().isoformat()
+        _now_ts = now
+    return _now_iso
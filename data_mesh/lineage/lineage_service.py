@@ -1,13 +1,35 @@
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta, timezone
+import sys
+import threading
 import logging
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from ..health import cached_now_iso
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_INITIAL_EDGE_CAPACITY = 1024
+
+def _to_epoch_us(dt: datetime) -> int:
+    """Encode a datetime as integer microseconds since the naive epoch."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MICROSECOND
+
+def _from_epoch_us(us: int) -> datetime:
+    """Decode integer microseconds since the naive epoch into a datetime."""
+    return _EPOCH + timedelta(microseconds=us)
+
 class DataNode(BaseModel):
     """Represents a node in the data lineage graph."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     id: str
     name: str
     type: str  # source, transformation, target
@@ -17,6 +39,8 @@ class DataNode(BaseModel):
 
 class DataEdge(BaseModel):
     """Represents an edge in the data lineage graph."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     source_id: str
     target_id: str
     transformation_type: str
@@ -29,31 +53,80 @@ class LineageGraph:
     edges: List[DataEdge]
 
 class DataLineageService:
-    """Service for managing data lineage information."""
+    """
+    Service for managing data lineage information.
+    
+    Writes are serialized by a lock; reads are lock-free, as in DataCatalog.
+    """
     
     def __init__(self):
+        self._lock = threading.Lock()
         self.nodes: Dict[str, DataNode] = {}
-        self.edges: List[DataEdge] = []
-        self._setup_logging()
+        # Edges are stored column-wise; DataEdge models are only built on read
+        self._edge_src: List[str] = []
+        self._edge_tgt: List[str] = []
+        self._edge_type: List[str] = []
+        self._edge_meta: List[Dict[str, Any]] = []
+        self._edge_ts: np.ndarray = np.empty(_INITIAL_EDGE_CAPACITY, dtype=np.int64)  # epoch microseconds
+        # Adjacency maps: source_id -> outgoing edge indices, target_id -> incoming edge indices
+        self._adj: Dict[str, List[int]] = defaultdict(list)
+        self._radj: Dict[str, List[int]] = defaultdict(list)
+        self._type_counts: Counter = Counter()
+        # Graph revision, bumped on every write, stamps cached impact analyses
+        self._revision = 0
+        self._impact_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+    
+    @property
+    def edges(self) -> List[DataEdge]:
+        """All edges in the graph, materialized as DataEdge models."""
+        return [self._build_edge(i) for i in range(len(self._edge_src))]
     
-    def _setup_logging(self):
-        """Configure logging for the lineage service."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    def _build_edge(self, index: int) -> DataEdge:
+        """Build the DataEdge stored at the given column index."""
+        # Columns only ever hold validated edges, so validation is skipped
+        return DataEdge.model_construct(
+            source_id=self._edge_src[index],
+            target_id=self._edge_tgt[index],
+            transformation_type=self._edge_type[index],
+            metadata=self._edge_meta[index],
+            created_at=_from_epoch_us(int(self._edge_ts[index]))
         )
     
     def add_node(self, node: DataNode) -> None:
         """Add a new node to the lineage graph."""
-        self.nodes[node.id] = node
+        with self._lock:
+            previous = self.nodes.get(node.id)
+            if previous is not None:
+                self._type_counts[previous.type] -= 1
+                if not self._type_counts[previous.type]:
+                    del self._type_counts[previous.type]
+            self._type_counts[node.type] += 1
+            self.nodes[node.id] = node
+            self._revision += 1
         logger.info(f"Added node: {node.id}")
     
     def add_edge(self, edge: DataEdge) -> None:
         """Add a new edge to the lineage graph."""
-        if edge.source_id not in self.nodes or edge.target_id not in self.nodes:
-            raise ValueError("Source or target node not found")
-        
-        self.edges.append(edge)
+        with self._lock:
+            if edge.source_id not in self.nodes or edge.target_id not in self.nodes:
+                raise ValueError("Source or target node not found")
+            
+            index = len(self._edge_src)
+            if index == len(self._edge_ts):
+                # Double the timestamp column so appends stay amortized O(1)
+                self._edge_ts = np.concatenate([self._edge_ts, np.empty(index, dtype=np.int64)])
+            source_id = sys.intern(edge.source_id)
+            target_id = sys.intern(edge.target_id)
+            # The source column is appended last: its length is what readers
+            # use to decide which rows are complete
+            self._edge_ts[index] = _to_epoch_us(edge.created_at)
+            self._edge_meta.append(edge.metadata)
+            self._edge_type.append(sys.intern(edge.transformation_type))
+            self._edge_tgt.append(target_id)
+            self._edge_src.append(source_id)
+            self._adj[source_id].append(index)
+            self._radj[target_id].append(index)
+            self._revision += 1
         logger.info(f"Added edge: {edge.source_id} -> {edge.target_id}")
     
     def get_node(self, node_id: str) -> Optional[DataNode]:
@@ -62,45 +135,51 @@ class DataLineageService:
     
     def get_upstream_nodes(self, node_id: str) -> List[DataNode]:
         """Get all upstream nodes for a given node."""
-        upstream_edges = [e for e in self.edges if e.target_id == node_id]
-        return [self.nodes[e.source_id] for e in upstream_edges]
+        edge_src = self._edge_src
+        return [self.nodes[edge_src[i]] for i in self._radj.get(node_id, [])]
     
     def get_downstream_nodes(self, node_id: str) -> List[DataNode]:
         """Get all downstream nodes for a given node."""
-        downstream_edges = [e for e in self.edges if e.source_id == node_id]
-        return [self.nodes[e.target_id] for e in downstream_edges]
+        edge_tgt = self._edge_tgt
+        return [self.nodes[edge_tgt[i]] for i in self._adj.get(node_id, [])]
     
     def get_lineage_path(self, source_id: str, target_id: str) -> List[DataEdge]:
         """Get the lineage path between two nodes."""
         if source_id not in self.nodes or target_id not in self.nodes:
             raise ValueError("Source or target node not found")
         
-        # Simple BFS implementation for finding path
-        queue = [(source_id, [])]
+        # Simple BFS implementation for finding path, tracking edge indices
+        edge_tgt = self._edge_tgt
+        queue = deque([(source_id, [])])
         visited = {source_id}
         
         while queue:
-            current_id, path = queue.pop(0)
+            current_id, path = queue.popleft()
             
             if current_id == target_id:
-                return path
+                return [self._build_edge(i) for i in path]
             
-            for edge in self.edges:
-                if edge.source_id == current_id and edge.target_id not in visited:
-                    visited.add(edge.target_id)
-                    queue.append((edge.target_id, path + [edge]))
+            for i in self._adj.get(current_id, []):
+                next_id = edge_tgt[i]
+                if next_id not in visited:
+                    visited.add(next_id)
+                    queue.append((next_id, path + [i]))
         
         return []
     
     def get_impact_analysis(self, node_id: str) -> Dict[str, Any]:
-        """Get impact analysis for a node."""
+        """Get impact analysis for a node, cached until the graph changes."""
         if node_id not in self.nodes:
             raise ValueError(f"Node {node_id} not found")
         
+        cached = self._impact_cache.get(node_id)
+        if cached is not None and cached[0] == self._revision:
+            return cached[1]
+        
         downstream_nodes = self.get_downstream_nodes(node_id)
         upstream_nodes = self.get_upstream_nodes(node_id)
         
-        return {
+        impact = {
             "node": self.nodes[node_id],
             "downstream_impact": {
                 "direct": len(downstream_nodes),
@@ -111,20 +190,19 @@ class DataLineageService:
                 "nodes": upstream_nodes
             }
         }
+        self._impact_cache[node_id] = (self._revision, impact)
+        return impact
     
     def get_graph_summary(self) -> Dict[str, Any]:
         """Get summary of the lineage graph."""
         return {
             "total_nodes": len(self.nodes),
-            "total_edges": len(self.edges),
-            "node_types": {
-                node_type: len([n for n in self.nodes.values() if n.type == node_type])
-                for node_type in set(n.type for n in self.nodes.values())
-            }
+            "total_edges": len(self._edge_src),
+            "node_types": dict(self._type_counts)
         }
 
 # FastAPI application
-app = FastAPI(title="Data Lineage Service")
+app = FastAPI(title="Data Lineage Service", default_response_class=ORJSONResponse)
 lineage_service = DataLineageService()
 
 class NodeRequest(BaseModel):
@@ -145,7 +223,7 @@ class EdgeRequest(BaseModel):
 async def add_node(node: NodeRequest):
     """Add a new node to the lineage graph."""
     try:
-        data_node = DataNode(**node.dict())
+        data_node = DataNode.model_construct(**node.__dict__)
         lineage_service.add_node(data_node)
         return data_node
     except Exception as e:
@@ -155,7 +233,7 @@ async def add_node(node: NodeRequest):
 async def add_edge(edge: EdgeRequest):
     """Add a new edge to the lineage graph."""
     try:
-        data_edge = DataEdge(**edge.dict())
+        data_edge = DataEdge.model_construct(**edge.__dict__)
         lineage_service.add_edge(data_edge)
         return data_edge
     except ValueError as e:
@@ -214,4 +292,4 @@ async def get_graph_summary():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()} 
\ No newline at end of file
+    return {"status": "healthy", "timestamp": cached_now_iso()} 
\ No newline at end of file
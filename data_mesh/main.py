@@ -1,14 +1,52 @@
+import logging.config
+import os
 import uvicorn
 from api.quality_service import app
 
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        }
+    },
+    "handlers": {
+        "default": {
+            "class": "logging.StreamHandler",
+            "formatter": "default"
+        }
+    },
+    "root": {"level": "INFO", "handlers": ["default"]}
+}
+
 def main():
     """Run the data quality service."""
+    # Configured once here; uvicorn re-applies log_config in each worker process
+    logging.config.dictConfig(LOGGING_CONFIG)
+    if os.getenv("DATA_MESH_RELOAD", "").lower() in ("1", "true", "yes"):
+        # Development mode: single process with auto-reload on code changes
+        uvicorn.run(
+            "api.quality_service:app",
+            host="0.0.0.0",
+            port=8000,
+            log_config=LOGGING_CONFIG,
+            reload=True
+        )
+        return
+
     uvicorn.run(
         "api.quality_service:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # State is held in process memory, so extra workers must be opted into
+        workers=int(os.getenv("DATA_MESH_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_config=LOGGING_CONFIG,
+        log_level="warning",
+        reload=False
     )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
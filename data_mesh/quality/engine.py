@@ -1,12 +1,21 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, TypeVar
 from datetime import datetime
+from functools import partial
 import logging
-from pydantic import BaseModel
+import numbers
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict
 
 logger = logging.getLogger(__name__)
 
+# Rule types the engine knows how to execute
+SUPPORTED_RULE_TYPES = frozenset({"not_null", "range"})
+
 class QualityRule(BaseModel):
     """Represents a data quality rule."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     name: str
     description: str
     rule_type: str
@@ -16,25 +25,69 @@ class QualityRule(BaseModel):
 
 class QualityResult(BaseModel):
     """Represents the result of a quality check."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     rule_name: str
     passed: bool
     message: str
     timestamp: datetime
     details: Optional[Dict[str, Any]] = None
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+class QualityCheckRecord(NamedTuple):
+    """
+    Lightweight quality check result used on hot paths and in stored
+    history, converted to a Pydantic model only when served.
+    """
+    rule_name: str
+    passed: bool
+    message: str
+    timestamp: int  # time.time_ns()
+    details: Optional[Dict[str, Any]] = None
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """The timestamp formatted as local-time ISO 8601."""
+        return datetime.fromtimestamp(self.timestamp / 1e9).isoformat()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to the JSON shape of QualityResult/QualityCheck."""
+        return {
+            "rule_name": self.rule_name,
+            "passed": self.passed,
+            "message": self.message,
+            "timestamp": self.timestamp_iso,
+            "details": self.details
+        }
+    
+    def to_model(self, model: Type[ModelT]) -> ModelT:
+        """
+        Convert the record to an API model with the same fields.
+        
+        Args:
+            model: Model class to build, e.g. QualityResult
+            
+        Returns:
+            Model instance built without re-validating the record
+        """
+        return model.model_construct(
+            rule_name=self.rule_name,
+            passed=self.passed,
+            message=self.message,
+            timestamp=datetime.fromtimestamp(self.timestamp / 1e9),
+            details=self.details
+        )
+
 class QualityEngine:
     """Core engine for data quality validation."""
     
     def __init__(self):
         self.rules: Dict[str, QualityRule] = {}
-        self._setup_logging()
-    
-    def _setup_logging(self):
-        """Configure logging for the quality engine."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        self._rule_dispatch: Dict[str, Callable[[QualityRule, Any], Tuple[bool, str]]] = {
+            "not_null": self._rule_not_null,
+            "range": self._rule_range,
+        }
     
     def add_rule(self, rule: QualityRule) -> None:
         """Add a new quality rule to the engine."""
@@ -79,6 +132,77 @@ class QualityEngine:
         
         return results
     
+    def compile_rule(self, rule: QualityRule) -> Callable[[Any], Tuple[bool, str]]:
+        """
+        Specialize a rule into a checker with its type and parameters resolved.
+        
+        Args:
+            rule: The quality rule to compile
+            
+        Returns:
+            Callable taking a value and returning (passed, message)
+        """
+        if rule.rule_type == "range":
+            min_val = rule.parameters.get("min")
+            max_val = rule.parameters.get("max")
+            
+            def check_range(data: Any) -> Tuple[bool, str]:
+                if min_val <= data <= max_val:
+                    return True, f"Value {data} is within range [{min_val}, {max_val}]"
+                return False, f"Value {data} is outside range [{min_val}, {max_val}]"
+            return check_range
+        
+        handler = self._rule_dispatch.get(rule.rule_type)
+        if handler is None:
+            rule_type = rule.rule_type
+            
+            def check_unknown(data: Any) -> Tuple[bool, str]:
+                raise ValueError(f"Unknown rule type: {rule_type}")
+            return check_unknown
+        return partial(handler, rule)
+    
+    def validate_batch(self, rule: QualityRule, arr: np.ndarray) -> np.ndarray:
+        """
+        Validate a column of values against a single rule in one vectorized pass.
+        
+        Args:
+            rule: The quality rule to apply
+            arr: Column of values to validate
+            
+        Returns:
+            Boolean array, True where the value passed the rule
+        """
+        if rule.rule_type == "not_null":
+            return ~pd.isna(arr)
+        if rule.rule_type == "range":
+            values = self._range_values(np.asarray(arr))
+            # Non-numbers became NaN, which fails both comparisons
+            return (values >= rule.parameters.get("min")) & (values <= rule.parameters.get("max"))
+        raise ValueError(f"Unknown rule type: {rule.rule_type}")
+    
+    @staticmethod
+    def _range_values(arr: np.ndarray) -> np.ndarray:
+        """
+        Convert a column to floats for a range check, mapping every value the
+        per-value range rule could not compare (strings, None, other objects)
+        to NaN so it fails instead of raising or being coerced.
+        
+        Args:
+            arr: Column of values
+            
+        Returns:
+            Float array of the same length
+        """
+        if arr.dtype.kind in "biuf":
+            return arr.astype(float)
+        values = np.full(len(arr), np.nan)
+        if arr.dtype.kind == "O":
+            is_number = np.fromiter(
+                (isinstance(v, numbers.Real) for v in arr), dtype=bool, count=len(arr)
+            )
+            values[is_number] = arr[is_number].astype(float)
+        return values
+    
     def _execute_rule(self, rule: QualityRule, data: Any) -> QualityResult:
         """
         Execute a single quality rule against the data.
@@ -90,22 +214,11 @@ class QualityEngine:
         Returns:
             Quality check result
         """
-        # This is a placeholder for actual rule execution logic
-        # In a real implementation, this would contain the actual validation logic
-        # based on the rule type and parameters
-        
         try:
-            # Example validation logic
-            if rule.rule_type == "not_null":
-                passed = data is not None
-                message = "Value is not null" if passed else "Value is null"
-            elif rule.rule_type == "range":
-                min_val = rule.parameters.get("min")
-                max_val = rule.parameters.get("max")
-                passed = min_val <= data <= max_val
-                message = f"Value {data} is within range [{min_val}, {max_val}]" if passed else f"Value {data} is outside range [{min_val}, {max_val}]"
-            else:
+            handler = self._rule_dispatch.get(rule.rule_type)
+            if handler is None:
                 raise ValueError(f"Unknown rule type: {rule.rule_type}")
+            passed, message = handler(rule, data)
             
             return QualityResult(
                 rule_name=rule.name,
@@ -116,4 +229,19 @@ class QualityEngine:
             
         except Exception as e:
             logger.error(f"Error in rule execution: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+    
+    def _rule_not_null(self, rule: QualityRule, data: Any) -> Tuple[bool, str]:
+        """Check that the value is not null."""
+        if data is not None:
+            return True, "Value is not null"
+        return False, "Value is null"
+    
+    def _rule_range(self, rule: QualityRule, data: Any) -> Tuple[bool, str]:
+        """Check that the value lies within the rule's [min, max] bounds."""
+        parameters = rule.parameters
+        min_val = parameters.get("min")
+        max_val = parameters.get("max")
+        if min_val <= data <= max_val:
+            return True, f"Value {data} is within range [{min_val}, {max_val}]"
+        return False, f"Value {data} is outside range [{min_val}, {max_val}]"
@@ -1,115 +1,245 @@
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, OrderedDict, Tuple
+from bisect import bisect_left
+from collections import defaultdict
 from datetime import datetime
+from time import perf_counter, time_ns
 import logging
-from prometheus_client import Counter, Gauge, Histogram
-from .engine import QualityEngine, QualityRule, QualityResult
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from .engine import SUPPORTED_RULE_TYPES, QualityEngine, QualityRule, QualityCheckRecord
 
 logger = logging.getLogger(__name__)
 
+# Duration buckets in seconds; single checks usually take microseconds, so
+# the default buckets (starting at 5ms) would put everything in the first one
+_CHECK_DURATION_BUCKETS = (1e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+# Maximum number of distinct record shapes whose execution plans are kept
+_PLAN_CACHE_SIZE = 256
+
 class QualityMonitor:
     """Service for monitoring data quality and generating alerts."""
     
-    def __init__(self):
+    def __init__(self, registry: CollectorRegistry = REGISTRY):
         self.engine = QualityEngine()
-        self._setup_metrics()
-        self._setup_logging()
+        # Field name ("*" for every field) -> (rule, checker, passed counter,
+        # failed counter, duration histogram) for enabled rules, rebuilt on
+        # rule changes so check_quality never resolves metric labels
+        self._rule_index: Dict[str, List[Tuple[QualityRule, Callable[[Any], Tuple[bool, str]], Any, Any, Any]]] = {}
+        # Record shape (field names in order) -> (field, rule entries) to run,
+        # least recently used first; cleared whenever the rule index changes
+        self._plan_cache: OrderedDict[Tuple[str, ...], List[Tuple[str, list]]] = OrderedDict()
+        self._setup_metrics(registry)
     
-    def _setup_metrics(self):
-        """Setup Prometheus metrics for monitoring."""
+    def _setup_metrics(self, registry: CollectorRegistry):
+        """
+        Setup Prometheus metrics for monitoring.
+        
+        Metrics are labelled by rule type rather than rule name to keep the
+        number of time series bounded; rule names go to the logs instead.
+        """
         self.quality_checks_total = Counter(
             'data_quality_checks_total',
             'Total number of quality checks performed',
-            ['rule_name', 'result']
+            ['rule_type', 'result'],
+            registry=registry
         )
         self.quality_check_duration = Histogram(
             'data_quality_check_duration_seconds',
             'Time spent performing quality checks',
-            ['rule_name']
+            ['rule_type'],
+            buckets=_CHECK_DURATION_BUCKETS,
+            registry=registry
         )
         self.quality_score = Gauge(
             'data_quality_score',
             'Overall data quality score',
-            ['domain']
-        )
-    
-    def _setup_logging(self):
-        """Configure logging for the quality monitor."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            ['domain'],
+            registry=registry
         )
     
     def add_quality_rule(self, rule: QualityRule) -> None:
         """Add a new quality rule to the monitor."""
+        if rule.rule_type not in SUPPORTED_RULE_TYPES:
+            # Rule types are metric labels, so unknown values must not grow them
+            raise ValueError(f"Unknown rule type: {rule.rule_type}")
         self.engine.add_rule(rule)
+        self._compile_plan()
         logger.info(f"Added quality rule to monitor: {rule.name}")
     
-    def check_quality(self, data: Dict[str, any], domain: str) -> List[QualityResult]:
+    def remove_quality_rule(self, rule_name: str) -> None:
+        """Remove a quality rule from the monitor."""
+        self.engine.remove_rule(rule_name)
+        self._compile_plan()
+        logger.info(f"Removed quality rule from monitor: {rule_name}")
+    
+    def _compile_plan(self) -> None:
+        """
+        Compile the enabled rules into checkers indexed by the fields they
+        apply to. Rules without a "fields" parameter apply to every field.
+        """
+        index = defaultdict(list)
+        for rule in self.engine.rules.values():
+            if not rule.enabled:
+                continue
+            entry = (
+                rule,
+                self.engine.compile_rule(rule),
+                self.quality_checks_total.labels(rule_type=rule.rule_type, result='passed'),
+                self.quality_checks_total.labels(rule_type=rule.rule_type, result='failed'),
+                self.quality_check_duration.labels(rule_type=rule.rule_type)
+            )
+            for field in rule.parameters.get("fields") or ["*"]:
+                index[field].append(entry)
+        self._rule_index = dict(index)
+        self._plan_cache = OrderedDict()
+    
+    def rules_for_field(self, field: str) -> List[QualityRule]:
+        """
+        Get the enabled rules that apply to a field, in the order
+        check_quality runs them.
+        
+        Args:
+            field: Field name
+            
+        Returns:
+            Rules without a "fields" parameter, then rules scoped to the field
+        """
+        index = self._rule_index
+        return [entry[0] for entry in index.get("*", []) + index.get(field, [])]
+    
+    def _get_plan(self, fields: Tuple[str, ...]) -> List[Tuple[str, list]]:
+        """
+        Get the execution plan for records with the given fields, building
+        and caching it on first use.
+        
+        Args:
+            fields: Field names of the record, in iteration order
+            
+        Returns:
+            (field, rule entries) pairs for every field that has rules
+        """
+        plan_cache = self._plan_cache
+        plan = plan_cache.get(fields)
+        if plan is not None:
+            plan_cache.move_to_end(fields)
+            return plan
+        
+        index = self._rule_index
+        all_fields_rules = index.get("*", [])
+        plan = []
+        for field in fields:
+            field_rules = index.get(field)
+            if field_rules:
+                plan.append((field, all_fields_rules + field_rules))
+            elif all_fields_rules:
+                plan.append((field, all_fields_rules))
+        
+        plan_cache[fields] = plan
+        if len(plan_cache) > _PLAN_CACHE_SIZE:
+            plan_cache.popitem(last=False)
+        return plan
+    
+    def check_quality(self, data: Dict[str, Any], domain: str, return_results: bool = True) -> List[QualityCheckRecord]:
         """
         Perform quality checks on the data.
         
         Args:
             data: Dictionary of data to check
             domain: Domain the data belongs to
+            return_results: Whether to build and return per-check results;
+                pass False to only update metrics
             
         Returns:
-            List of quality check results
+            List of quality check results, empty when return_results is False
         """
         results = []
+        passed_n = total_n = 0
+        # Metric updates are aggregated locally and flushed once per call,
+        # so each metric child's lock is taken once rather than per check
+        counts: Dict[Any, int] = defaultdict(int)
+        # Histogram child -> [sum of durations, observation count per bucket]
+        durations: Dict[Any, list] = {}
         
-        for field, value in data.items():
-            # Get rules for this field
-            field_rules = self._get_rules_for_field(field)
-            
-            for rule in field_rules:
-                with self.quality_check_duration.labels(rule_name=rule.name).time():
-                    result = self.engine.validate_data(value, rule.name)
-                    results.extend(result)
-                    
-                    # Update metrics
-                    self.quality_checks_total.labels(
+        for field, field_rules in self._get_plan(tuple(data)):
+            value = data[field]
+            for rule, check, passed_counter, failed_counter, hist in field_rules:
+                t0 = perf_counter()
+                try:
+                    passed, message = check(value)
+                except Exception as e:
+                    logger.error(f"Error executing rule {rule.name}: {str(e)}")
+                    passed, message = False, f"Error executing rule: {str(e)}"
+                elapsed = perf_counter() - t0
+                observed = durations.get(hist)
+                if observed is None:
+                    observed = durations[hist] = [0.0, [0] * len(hist._upper_bounds)]
+                observed[0] += elapsed
+                observed[1][self._bucket_index(hist, elapsed)] += 1
+                total_n += 1
+                passed_n += bool(passed)
+                if return_results:
+                    results.append(QualityCheckRecord(
                         rule_name=rule.name,
-                        result='passed' if result[0].passed else 'failed'
-                    ).inc()
+                        passed=passed,
+                        message=message,
+                        timestamp=time_ns()
+                    ))
+                
+                counts[passed_counter if passed else failed_counter] += 1
+                if not passed:
+                    logger.debug("Quality rule %s failed on field %s: %s", rule.name, field, message)
+        
+        # Update metrics
+        for counter, n in counts.items():
+            counter.inc(n)
+        for hist, (total_duration, bucket_counts) in durations.items():
+            self._observe_many(hist, total_duration, bucket_counts)
         
         # Update quality score
-        self._update_quality_score(domain, results)
+        if total_n:
+            self._update_quality_score(domain, passed_n / total_n * 100.0)
         
         return results
     
-    def _get_rules_for_field(self, field: str) -> List[QualityRule]:
+    @staticmethod
+    def _bucket_index(hist: Any, value: float) -> int:
+        """Index of the histogram bucket observe() would count a value in (value <= bound)."""
+        return bisect_left(hist._upper_bounds, value)
+    
+    @staticmethod
+    def _observe_many(hist: Any, total: float, bucket_counts: List[int]) -> None:
         """
-        Get quality rules applicable to a specific field.
+        Record many observations on a histogram child at once.
+        
+        prometheus_client has no bulk observe, so this updates the child's
+        sum and bucket values directly, matching what observe() does per value.
+        These are private attributes of prometheus_client, which is pinned in
+        requirements.txt; a test compares the result with observe().
         
         Args:
-            field: Field name to get rules for
-            
-        Returns:
-            List of applicable quality rules
+            hist: Histogram child to update
+            total: Sum of the observed values
+            bucket_counts: Number of observations per bucket, indexed like
+                the histogram's upper bounds
         """
-        # In a real implementation, this would filter rules based on field metadata
-        # For now, return all rules
-        return list(self.engine.rules.values())
+        hist._raise_if_not_observable()
+        hist._sum.inc(total)
+        for bucket, n in zip(hist._buckets, bucket_counts):
+            if n:
+                bucket.inc(n)
     
-    def _update_quality_score(self, domain: str, results: List[QualityResult]) -> None:
+    def _update_quality_score(self, domain: str, score: float) -> None:
         """
         Update the quality score for a domain.
         
         Args:
             domain: Domain to update score for
-            results: Quality check results
+            score: Percentage of checks that passed
         """
-        if not results:
-            return
-            
-        passed_count = sum(1 for r in results if r.passed)
-        total_count = len(results)
-        score = (passed_count / total_count) * 100
-        
         self.quality_score.labels(domain=domain).set(score)
         logger.info(f"Updated quality score for domain {domain}: {score:.2f}%")
     
-    def get_quality_report(self, domain: str) -> Dict[str, any]:
+    def get_quality_report(self, domain: str) -> Dict[str, Any]:
         """
         Generate a quality report for a domain.
         
@@ -123,6 +253,16 @@ class QualityMonitor:
             'domain': domain,
             'timestamp': datetime.now().isoformat(),
             'quality_score': self.quality_score.labels(domain=domain)._value.get(),
-            'total_checks': self.quality_checks_total._value.get(),
-            'check_duration': self.quality_check_duration._value.get()
-        } 
\ No newline at end of file
+            'total_checks': int(self._sum_samples(self.quality_checks_total, 'data_quality_checks_total')),
+            'check_duration': self._sum_samples(self.quality_check_duration, 'data_quality_check_duration_seconds_sum')
+        }
+    
+    @staticmethod
+    def _sum_samples(metric: Any, sample_name: str) -> float:
+        """Sum a sample across every label combination of a metric."""
+        return float(sum(
+            sample.value
+            for family in metric.collect()
+            for sample in family.samples
+            if sample.name == sample_name
+        )) 
\ No newline at end of file
@@ -1,8 +1,21 @@
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Callable, ClassVar, Deque, Dict, List, Optional, Tuple, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+import os
+import sys
+import threading
+import time
 import logging
-from pydantic import BaseModel, Field
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from .engine import QualityCheckRecord
+from ..health import cached_now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +29,8 @@ class QualityRule(BaseModel):
     enabled: bool = True
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    # Checker with the rule's type and parameters resolved, compiled when the rule is added
+    _executor: Optional[Callable[[Any], Dict[str, Any]]] = PrivateAttr(default=None)
 
 class QualityCheck(BaseModel):
     """Represents a quality check result."""
@@ -28,20 +43,25 @@ class QualityCheck(BaseModel):
 class DataQualityService:
     """Service for managing data quality rules and checks."""
     
-    def __init__(self):
+    def __init__(self, history_size: int = 10_000):
+        if history_size < 1:
+            raise ValueError(f"history_size must be at least 1, got {history_size}")
         self.rules: Dict[str, QualityRule] = {}
-        self.check_history: Dict[str, List[QualityCheck]] = {}
-        self._setup_logging()
-    
-    def _setup_logging(self):
-        """Configure logging for the quality service."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        self.history_size = history_size
+        self.check_history: Dict[str, Deque[QualityCheckRecord]] = {}
+        # Rolling (passed, total) counts over the checks currently held in history
+        self._counters: Dict[str, Tuple[int, int]] = {}
+        self._history_locks: Dict[str, threading.Lock] = {}
+        # Worker pool for running rules in parallel, started on first use and
+        # dropped by close() so the service can be used again afterwards
+        self._exec: Optional[ThreadPoolExecutor] = None
+        self._exec_lock = threading.Lock()
     
     def add_rule(self, rule: QualityRule) -> None:
         """Add a new quality rule."""
+        # Interned so rule type comparisons against literals short-circuit on identity
+        rule.rule_type = sys.intern(rule.rule_type)
+        rule._executor = self._compile_rule(rule)
         self.rules[rule.name] = rule
         logger.info(f"Added quality rule: {rule.name}")
     
@@ -51,70 +71,196 @@ class DataQualityService:
             del self.rules[rule_name]
             logger.info(f"Removed quality rule: {rule_name}")
     
-    def run_quality_check(self, data: Any, rule_name: Optional[str] = None) -> List[QualityCheck]:
-        """Run quality checks against data."""
-        results = []
-        rules_to_check = [self.rules[rule_name]] if rule_name else [
-            r for r in self.rules.values() if r.enabled
-        ]
+    def _enabled_rules(self) -> List[QualityRule]:
+        """Get the currently enabled rules in registration order."""
+        return [r for r in list(self.rules.values()) if r.enabled]
+    
+    def close(self) -> None:
+        """Shut down the worker threads used to run quality checks."""
+        with self._exec_lock:
+            executor, self._exec = self._exec, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, starting it if it is not running."""
+        executor = self._exec
+        if executor is None:
+            with self._exec_lock:
+                if self._exec is None:
+                    self._exec = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+                executor = self._exec
+        return executor
+    
+    def run_quality_check(self, data: Any, rule_name: Optional[str] = None) -> List[QualityCheckRecord]:
+        """Run quality checks against data, executing independent rules in parallel."""
+        if rule_name:
+            rule = self.rules.get(rule_name)
+            if rule is None:
+                return [QualityCheckRecord(
+                    rule_name=rule_name,
+                    passed=False,
+                    message="Rule not found",
+                    timestamp=time.time_ns()
+                )]
+            if not rule.enabled:
+                return []
+            rules_to_check = [rule]
+        else:
+            rules_to_check = self._enabled_rules()
+        
+        if not rules_to_check:
+            return []
+        
+        if len(rules_to_check) == 1:
+            # Not worth a round trip through the thread pool
+            return [self._execute_rule_safe(rules_to_check[0], data)]
+        
+        executor = self._executor()
+        futures = [executor.submit(self._execute_rule_safe, rule, data) for rule in rules_to_check]
+        return [future.result() for future in futures]
+    
+    def run_quality_check_batch(self, records: List[Dict[str, Any]]) -> List[QualityCheckRecord]:
+        """
+        Run the enabled rules against many records at once and return one
+        failed check per failing record. Completeness rules are evaluated
+        column-wise on a DataFrame, so a null value counts as a missing
+        field; other rules run record by record. Batch checks are not added
+        to the check history.
+        """
+        if not records:
+            return []
         
-        for rule in rules_to_check:
+        df = pd.DataFrame.from_records(records)
+        timestamp = time.time_ns()
+        failures: List[QualityCheckRecord] = []
+        for rule in self._enabled_rules():
+            if rule.rule_type == "completeness":
+                failures.extend(self._check_completeness_batch(df, rule, timestamp))
+                continue
             try:
-                result = self._execute_rule(rule, data)
-                results.append(result)
-                
-                # Store check history
-                if rule.name not in self.check_history:
-                    self.check_history[rule.name] = []
-                self.check_history[rule.name].append(result)
-                
+                for row, record in enumerate(records):
+                    result = self._execute_rule(rule, record)
+                    if not result.passed:
+                        failures.append(result._replace(details={**(result.details or {}), "row": row}))
             except Exception as e:
                 logger.error(f"Error executing rule {rule.name}: {str(e)}")
-                results.append(QualityCheck(
+                failures.append(QualityCheckRecord(
                     rule_name=rule.name,
                     passed=False,
-                    message=f"Error executing rule: {str(e)}"
+                    message=f"Error executing rule: {str(e)}",
+                    timestamp=timestamp
                 ))
+        return failures
+    
+    def _check_completeness_batch(self, df: pd.DataFrame, rule: QualityRule, timestamp: int) -> List[QualityCheckRecord]:
+        """Check completeness of every row of a DataFrame, returning a failed check per incomplete row."""
+        required_fields = rule.parameters.get("required_fields", [])
+        present = [field for field in required_fields if field in df.columns]
+        absent = [field for field in required_fields if field not in df.columns]
+        
+        null_mask = df[present].isna().to_numpy()
+        failing_rows = np.arange(len(df)) if absent else np.flatnonzero(null_mask.any(axis=1))
         
-        return results
+        failures = []
+        for row in failing_rows.tolist():
+            null_fields = {present[i] for i in np.flatnonzero(null_mask[row]).tolist()}
+            missing_fields = [
+                field for field in required_fields
+                if field in null_fields or field not in df.columns
+            ]
+            failures.append(QualityCheckRecord(
+                rule_name=rule.name,
+                passed=False,
+                message=f"Missing required fields: {missing_fields}",
+                timestamp=timestamp,
+                details={"row": row, "missing_fields": missing_fields}
+            ))
+        return failures
     
-    def _execute_rule(self, rule: QualityRule, data: Any) -> QualityCheck:
-        """Execute a single quality rule against data."""
+    def _execute_rule_safe(self, rule: QualityRule, data: Any) -> QualityCheckRecord:
+        """Execute a rule and record it in the check history, converting errors into failed checks."""
         try:
-            if rule.rule_type == "completeness":
-                result = self._check_completeness(data, rule.parameters)
-            elif rule.rule_type == "accuracy":
-                result = self._check_accuracy(data, rule.parameters)
-            elif rule.rule_type == "consistency":
-                result = self._check_consistency(data, rule.parameters)
-            elif rule.rule_type == "timeliness":
-                result = self._check_timeliness(data, rule.parameters)
-            else:
-                raise ValueError(f"Unknown rule type: {rule.rule_type}")
-            
-            return QualityCheck(
+            result = self._execute_rule(rule, data)
+        except Exception as e:
+            logger.error(f"Error executing rule {rule.name}: {str(e)}")
+            return QualityCheckRecord(
                 rule_name=rule.name,
-                passed=result["passed"],
-                message=result["message"],
-                details=result.get("details")
+                passed=False,
+                message=f"Error executing rule: {str(e)}",
+                timestamp=time.time_ns()
             )
+        
+        self._record_check(rule.name, result)
+        return result
+    
+    def _record_check(self, rule_name: str, result: QualityCheckRecord) -> None:
+        """Append a check to the bounded history, keeping the rolling counters in step."""
+        with self._history_locks.setdefault(rule_name, threading.Lock()):
+            history = self.check_history.get(rule_name)
+            if history is None:
+                history = self.check_history[rule_name] = deque(maxlen=self.history_size)
+            passed, total = self._counters.get(rule_name, (0, 0))
+            if len(history) == history.maxlen:
+                # The oldest check is about to be evicted
+                passed -= history[0].passed
+                total -= 1
+            history.append(result)
+            self._counters[rule_name] = (passed + result.passed, total + 1)
+    
+    def _compile_rule(self, rule: QualityRule) -> Callable[[Any], Dict[str, Any]]:
+        """
+        Specialize a rule into a checker with its type and parameters resolved.
+        Completeness rules are built here; other types wrap their _DISPATCH handler.
+        """
+        if rule.rule_type == "completeness":
+            required_fields = list(rule.parameters.get("required_fields", []))
+            required = frozenset(required_fields)
             
-        except Exception as e:
-            logger.error(f"Error in rule execution: {str(e)}")
-            raise
+            def check_completeness(data: Any) -> Dict[str, Any]:
+                missing = required.difference(data)
+                if not missing:
+                    return {
+                        "passed": True,
+                        "message": "All required fields present",
+                        "details": {"missing_fields": []}
+                    }
+                missing_fields = [field for field in required_fields if field in missing]
+                return {
+                    "passed": False,
+                    "message": f"Missing required fields: {missing_fields}",
+                    "details": {"missing_fields": missing_fields}
+                }
+            return check_completeness
+        
+        handler = self._DISPATCH.get(rule.rule_type)
+        if handler is None:
+            rule_type = rule.rule_type
+            
+            def check_unknown(data: Any) -> Dict[str, Any]:
+                raise ValueError(f"Unknown rule type: {rule_type}")
+            return check_unknown
+        
+        def check_rule(data: Any) -> Dict[str, Any]:
+            return handler(self, data, rule)
+        return check_rule
     
-    def _check_completeness(self, data: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Check data completeness."""
-        required_fields = parameters.get("required_fields", [])
-        missing_fields = [field for field in required_fields if field not in data]
+    def _execute_rule(self, rule: QualityRule, data: Any) -> QualityCheckRecord:
+        """Execute a single quality rule against data."""
+        executor = rule._executor
+        if executor is None:
+            executor = rule._executor = self._compile_rule(rule)
+        result = executor(data)
         
-        return {
-            "passed": len(missing_fields) == 0,
-            "message": f"Missing required fields: {missing_fields}" if missing_fields else "All required fields present",
-            "details": {"missing_fields": missing_fields}
-        }
+        return QualityCheckRecord(
+            rule_name=rule.name,
+            passed=result["passed"],
+            message=result["message"],
+            timestamp=time.time_ns(),
+            details=result.get("details")
+        )
     
-    def _check_accuracy(self, data: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_accuracy(self, data: Any, rule: QualityRule) -> Dict[str, Any]:
         """Check data accuracy."""
         # Implement accuracy check logic
         return {
@@ -122,7 +268,7 @@ class DataQualityService:
             "message": "Accuracy check passed"
         }
     
-    def _check_consistency(self, data: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_consistency(self, data: Any, rule: QualityRule) -> Dict[str, Any]:
         """Check data consistency."""
         # Implement consistency check logic
         return {
@@ -130,7 +276,7 @@ class DataQualityService:
             "message": "Consistency check passed"
         }
     
-    def _check_timeliness(self, data: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_timeliness(self, data: Any, rule: QualityRule) -> Dict[str, Any]:
         """Check data timeliness."""
         # Implement timeliness check logic
         return {
@@ -138,27 +284,42 @@ class DataQualityService:
             "message": "Timeliness check passed"
         }
     
+    _DISPATCH: ClassVar[Dict[str, Callable[["DataQualityService", Any, QualityRule], Dict[str, Any]]]] = {
+        "accuracy": _check_accuracy,
+        "consistency": _check_consistency,
+        "timeliness": _check_timeliness,
+    }
+    
+    def get_check_records(self, rule_name: str) -> List[QualityCheckRecord]:
+        """Get a snapshot of the stored check records for a rule, oldest first."""
+        return list(self.check_history.get(rule_name, ()))
+    
     def get_check_history(self, rule_name: str) -> List[QualityCheck]:
         """Get check history for a rule."""
-        return self.check_history.get(rule_name, [])
+        return [record.to_model(QualityCheck) for record in self.get_check_records(rule_name)]
     
     def get_quality_metrics(self) -> Dict[str, Any]:
         """Get overall quality metrics."""
-        total_checks = sum(len(checks) for checks in self.check_history.values())
-        passed_checks = sum(
-            sum(1 for check in checks if check.passed)
-            for checks in self.check_history.values()
-        )
+        passed_checks = total_checks = 0
+        for passed, total in list(self._counters.values()):
+            passed_checks += passed
+            total_checks += total
         
         return {
             "total_checks": total_checks,
             "passed_checks": passed_checks,
             "pass_rate": (passed_checks / total_checks * 100) if total_checks > 0 else 0,
-            "active_rules": len([r for r in self.rules.values() if r.enabled])
+            "active_rules": len(self._enabled_rules())
         }
 
 # FastAPI application
-app = FastAPI(title="Data Quality Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Release the quality service's worker threads when the app shuts down."""
+    yield
+    quality_service.close()
+
+app = FastAPI(title="Data Quality Service", default_response_class=ORJSONResponse, lifespan=lifespan)
 quality_service = DataQualityService()
 
 class RuleRequest(BaseModel):
@@ -174,7 +335,7 @@ class RuleRequest(BaseModel):
 async def add_rule(rule: RuleRequest):
     """Add a new quality rule."""
     try:
-        quality_rule = QualityRule(**rule.dict())
+        quality_rule = QualityRule.model_construct(**rule.__dict__)
         quality_service.add_rule(quality_rule)
         return quality_rule
     except Exception as e:
@@ -193,25 +354,27 @@ async def remove_rule(name: str):
 async def run_quality_check(data: Dict[str, Any], rule_name: Optional[str] = None):
     """Run quality checks against data."""
     try:
-        results = quality_service.run_quality_check(data, rule_name)
-        return {"results": results}
+        # Waits on the rule thread pool, so keep it off the event loop
+        results = await run_in_threadpool(quality_service.run_quality_check, data, rule_name)
+        return ORJSONResponse({"results": [result.to_dict() for result in results]})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/rules/{name}/history")
 async def get_check_history(name: str):
     """Get check history for a rule."""
-    history = quality_service.get_check_history(name)
+    # Serialize the stored records directly rather than via QualityCheck models
+    history = quality_service.get_check_records(name)
     if not history:
         raise HTTPException(status_code=404, detail=f"No history found for rule {name}")
-    return {"history": history}
+    return ORJSONResponse({"history": [record.to_dict() for record in history]})
 
 @app.get("/metrics")
 async def get_quality_metrics():
     """Get overall quality metrics."""
-    return quality_service.get_quality_metrics()
+    return ORJSONResponse(quality_service.get_quality_metrics())
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()} 
\ No newline at end of file
+    return {"status": "healthy", "timestamp": cached_now_iso()} 
\ No newline at end of file
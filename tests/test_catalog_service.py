@@ -1,3 +1,5 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from datetime import datetime
 from data_mesh.catalog.catalog import (
@@ -63,6 +65,62 @@ def test_update_product(catalog, sample_product):
     catalog.update_product(updated_product)
     assert catalog.products[sample_product.name].description == "Updated description"
 
+def test_product_dump_omits_unset_optional_fields():
+    """Test that unset list fields are left out of product dumps."""
+    product = DataProduct(
+        name="bare_product",
+        description="Product without tags",
+        domain="test_domain",
+        owner="test_owner",
+        version="1.0.0",
+        schema={},
+        tags=["explicit"]
+    )
+    dumped = product.model_dump()
+    assert dumped["tags"] == ["explicit"]
+    assert "quality_rules" not in dumped
+    assert "policies" not in dumped
+
+def test_update_product_stamps_updated_at(catalog, sample_product):
+    """Test that updating a product stores a copy with a new updated_at."""
+    catalog.register_product(sample_product)
+    stored = catalog.update_product(sample_product)
+    assert catalog.products[sample_product.name] is stored
+    assert stored is not sample_product
+    assert stored.updated_at >= sample_product.updated_at
+
+def test_concurrent_register_product(catalog, sample_product):
+    """Test registering products from several threads at once."""
+    def register(i):
+        catalog.register_product(DataProduct(
+            **{**sample_product.model_dump(), "name": f"product_{i}"}
+        ))
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(register, range(200)))
+    
+    assert len(catalog.list_products(domain="test_domain")) == 200
+    assert len(catalog.search_products("sample")) == 200
+
+def test_reads_during_concurrent_register(catalog, sample_product):
+    """Test that lineage and quality reads never see a half-registered product."""
+    names = [f"product_{i}" for i in range(200)]
+    
+    def register():
+        for name in names:
+            catalog.register_product(DataProduct(**{**sample_product.model_dump(), "name": name}))
+    
+    def read():
+        for name in names * 5:
+            if catalog.get_product(name) is not None:
+                catalog.get_product_lineage(name)
+                catalog.get_product_quality(name)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(register), executor.submit(read)]
+        for future in futures:
+            future.result()
+
 def test_update_nonexistent_product(catalog, sample_product):
     """Test updating a nonexistent product."""
     with pytest.raises(ValueError, match="Product .* not found"):
@@ -91,6 +149,40 @@ def test_list_products_by_domain(catalog, sample_product):
     products = catalog.list_products(domain="other_domain")
     assert len(products) == 0
 
+def test_list_products_after_domain_change(catalog, sample_product):
+    """Test that updating a product's domain moves it between domains."""
+    catalog.register_product(sample_product)
+    moved_product = DataProduct(
+        **{**sample_product.model_dump(), "domain": "other_domain"}
+    )
+    moved_product = catalog.update_product(moved_product)
+    assert catalog.list_products(domain="test_domain") == []
+    assert catalog.list_products(domain="other_domain") == [moved_product]
+
+def test_get_product_json(catalog, sample_product):
+    """Test that cached product JSON is refreshed after an update."""
+    catalog.register_product(sample_product)
+    assert json.loads(catalog.get_product_json(sample_product))["description"] == "Test data product"
+    
+    updated_product = DataProduct(
+        **{**sample_product.model_dump(), "description": "Updated description"}
+    )
+    catalog.update_product(updated_product)
+    assert json.loads(catalog.get_product_json(updated_product))["description"] == "Updated description"
+
+def test_get_product_json_ignores_stale_product(catalog, sample_product):
+    """Test that encoding a product overtaken by an update does not cache stale JSON."""
+    catalog.register_product(sample_product)
+    listed = catalog.list_products()
+    
+    catalog.update_product(DataProduct(
+        **{**sample_product.model_dump(), "description": "Updated description"}
+    ))
+    assert json.loads(catalog.get_product_json(listed[0]))["description"] == "Test data product"
+    
+    current = catalog.get_product(sample_product.name)
+    assert json.loads(catalog.get_product_json(current))["description"] == "Updated description"
+
 def test_add_version(catalog, sample_product, sample_version):
     """Test adding a new version to a data product."""
     catalog.register_product(sample_product)
@@ -112,6 +204,14 @@ def test_get_versions(catalog, sample_product, sample_version):
     assert len(versions) == 1
     assert versions[0] == sample_version
 
+def test_list_products_by_domain_keeps_registration_order(catalog, sample_product):
+    """Test that domain-filtered listings keep the order products were registered in."""
+    for name in ["zeta", "alpha", "mid"]:
+        catalog.register_product(DataProduct(**{**sample_product.model_dump(), "name": name}))
+    unfiltered = [p.name for p in catalog.list_products()]
+    assert unfiltered == ["zeta", "alpha", "mid"]
+    assert [p.name for p in catalog.list_products(domain=sample_product.domain)] == unfiltered
+
 def test_search_products(catalog, sample_product):
     """Test searching for data products."""
     catalog.register_product(sample_product)
@@ -135,6 +235,33 @@ def test_search_products(catalog, sample_product):
     results = catalog.search_products("nonexistent")
     assert len(results) == 0
 
+def test_search_products_matches_snake_case_substrings(catalog, sample_product):
+    """Test that a word inside a snake_case name matches alongside exact words elsewhere."""
+    for name, description in [("customer_orders", "Orders placed"), ("crm", "Customer master")]:
+        catalog.register_product(DataProduct(
+            **{**sample_product.model_dump(), "name": name, "description": description, "tags": []}
+        ))
+    assert [p.name for p in catalog.search_products("customer")] == ["customer_orders", "crm"]
+    assert [p.name for p in catalog.search_products("cust")] == ["customer_orders", "crm"]
+    assert [p.name for p in catalog.search_products("rm")] == ["crm"]
+    assert catalog.search_products("orders placed") == [catalog.get_product("customer_orders")]
+    assert catalog.search_products("placed orders") == []
+
+def test_search_products_after_update(catalog, sample_product):
+    """Test that search reflects updated product fields."""
+    catalog.register_product(sample_product)
+    updated_product = DataProduct(
+        **{**sample_product.model_dump(), "description": "Customer accounts", "tags": []}
+    )
+    updated_product = catalog.update_product(updated_product)
+    
+    # Stale tokens no longer match
+    assert catalog.search_products("sample") == []
+    
+    # Multi-word and partial-word queries
+    assert catalog.search_products("customer accounts") == [updated_product]
+    assert catalog.search_products("acc") == [updated_product]
+
 def test_get_product_lineage(catalog, sample_product):
     """Test retrieving product lineage information."""
     catalog.register_product(sample_product)
@@ -144,6 +271,26 @@ def test_get_product_lineage(catalog, sample_product):
     assert isinstance(lineage["dependencies"], list)
     assert isinstance(lineage["dependents"], list)
 
+def test_get_product_lineage_reflects_new_versions(catalog, sample_product, sample_version):
+    """Test that cached lineage is rebuilt after a version is added."""
+    catalog.register_product(sample_product)
+    assert catalog.get_product_lineage(sample_product.name)["versions"] == []
+    
+    catalog.add_version(sample_version)
+    lineage = catalog.get_product_lineage(sample_product.name)
+    assert lineage["versions"] == [sample_version.version]
+
+def test_get_product_lineage_expires_after_max_staleness(sample_product):
+    """Test that cached lineage is rebuilt once it is older than max_staleness."""
+    catalog = DataCatalog(max_staleness=0.0)
+    catalog.register_product(sample_product)
+    first = catalog.get_product_lineage(sample_product.name)
+    assert catalog.get_product_lineage(sample_product.name) is not first
+    
+    catalog.max_staleness = 60.0
+    cached = catalog.get_product_lineage(sample_product.name)
+    assert catalog.get_product_lineage(sample_product.name) is cached
+
 def test_get_product_quality(catalog, sample_product):
     """Test retrieving product quality information."""
     catalog.register_product(sample_product)
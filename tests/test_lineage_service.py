@@ -71,6 +71,26 @@ def test_add_edge(lineage_service, sample_nodes, sample_edges):
         lineage_service.add_edge(edge)
         assert edge in lineage_service.edges
 
+def test_edges_round_trip_beyond_initial_capacity(lineage_service, sample_nodes):
+    """Test that stored edges are rebuilt unchanged as the edge columns grow."""
+    for node in sample_nodes:
+        lineage_service.add_node(node)
+    
+    edges = [
+        DataEdge(
+            source_id="source1",
+            target_id="transform1",
+            transformation_type="extract",
+            metadata={"batch": i}
+        )
+        for i in range(1500)
+    ]
+    for edge in edges:
+        lineage_service.add_edge(edge)
+    
+    assert lineage_service.edges == edges
+    assert lineage_service.get_graph_summary()["total_edges"] == 1500
+
 def test_add_edge_missing_node(lineage_service):
     """Test adding an edge with missing nodes."""
     edge = DataEdge(
@@ -145,6 +165,18 @@ def test_get_impact_analysis(lineage_service, sample_nodes, sample_edges):
     assert impact["downstream_impact"]["direct"] == 1
     assert impact["upstream_dependencies"]["direct"] == 1
 
+def test_get_impact_analysis_reflects_new_edges(lineage_service, sample_nodes, sample_edges):
+    """Test that cached impact analysis is rebuilt after the graph changes."""
+    for node in sample_nodes:
+        lineage_service.add_node(node)
+    assert lineage_service.get_impact_analysis("transform1")["downstream_impact"]["direct"] == 0
+    
+    for edge in sample_edges:
+        lineage_service.add_edge(edge)
+    impact = lineage_service.get_impact_analysis("transform1")
+    assert impact["downstream_impact"]["direct"] == 1
+    assert impact["upstream_dependencies"]["direct"] == 1
+
 def test_get_graph_summary(lineage_service, sample_nodes, sample_edges):
     """Test retrieving graph summary."""
     # Setup graph
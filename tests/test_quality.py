@@ -1,4 +1,7 @@
+import numpy as np
 import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Histogram
 from datetime import datetime
 from data_mesh.quality.engine import QualityEngine, QualityRule, QualityResult
 from data_mesh.quality.monitor import QualityMonitor
@@ -9,7 +12,7 @@ def quality_engine():
 
 @pytest.fixture
 def quality_monitor():
-    return QualityMonitor()
+    return QualityMonitor(registry=CollectorRegistry())
 
 @pytest.fixture
 def sample_rule():
@@ -68,6 +71,44 @@ def test_validate_data_range(quality_engine):
     assert len(results) == 1
     assert not results[0].passed
 
+def test_compile_rule(quality_engine, sample_rule):
+    """Test compiled rule checkers."""
+    range_rule = QualityRule(
+        name="range_rule",
+        description="Range test rule",
+        rule_type="range",
+        parameters={"min": 1, "max": 10},
+        severity="high"
+    )
+    check = quality_engine.compile_rule(range_rule)
+    assert check(5) == (True, "Value 5 is within range [1, 10]")
+    assert check(11) == (False, "Value 11 is outside range [1, 10]")
+    
+    check = quality_engine.compile_rule(sample_rule)
+    assert check("test")[0]
+    assert not check(None)[0]
+
+def test_validate_batch(quality_engine, sample_rule):
+    """Test vectorized validation of a column of values."""
+    range_rule = QualityRule(
+        name="range_rule",
+        description="Range test rule",
+        rule_type="range",
+        parameters={"min": 1, "max": 10},
+        severity="high"
+    )
+    
+    passed = quality_engine.validate_batch(range_rule, np.asarray([0, 5, 10, 11]))
+    assert passed.tolist() == [False, True, True, False]
+    
+    passed = quality_engine.validate_batch(sample_rule, np.asarray(["a", None, "b"]))
+    assert passed.tolist() == [True, False, True]
+    
+    # Values the per-value rule cannot compare fail rather than raise or coerce
+    mixed = np.asarray([5, "5", "bob", None, 11.0], dtype=object)
+    assert quality_engine.validate_batch(range_rule, mixed).tolist() == [True, False, False, False, False]
+    assert quality_engine.validate_batch(range_rule, np.asarray(["5", "7"])).tolist() == [False, False]
+
 def test_quality_monitor_check(quality_monitor, sample_rule):
     """Test quality monitoring."""
     quality_monitor.add_quality_rule(sample_rule)
@@ -99,4 +140,132 @@ def test_quality_monitor_report(quality_monitor, sample_rule):
     assert isinstance(report["timestamp"], str)
     assert isinstance(report["quality_score"], float)
     assert isinstance(report["total_checks"], int)
-    assert isinstance(report["check_duration"], float) 
\ No newline at end of file
+    assert isinstance(report["check_duration"], float) 
+
+def test_quality_monitor_field_scoped_rules(quality_monitor, sample_rule):
+    """Test that rules with a fields parameter only check those fields."""
+    quality_monitor.add_quality_rule(sample_rule)
+    quality_monitor.add_quality_rule(QualityRule(
+        name="age_range",
+        description="Age range rule",
+        rule_type="range",
+        parameters={"min": 0, "max": 120, "fields": ["age"]},
+        severity="high"
+    ))
+    
+    results = quality_monitor.check_quality({"name": "test", "age": 130}, "test_domain")
+    assert [(r.rule_name, r.passed) for r in results] == [
+        ("test_rule", True),
+        ("test_rule", True),
+        ("age_range", False),
+    ]
+    
+    report = quality_monitor.get_quality_report("test_domain")
+    assert report["total_checks"] == 3
+
+def test_quality_monitor_plan_cache_invalidated_on_rule_change(quality_monitor, sample_rule):
+    """Test that cached execution plans are rebuilt after rules change."""
+    quality_monitor.add_quality_rule(sample_rule)
+    assert len(quality_monitor.check_quality({"name": "test", "age": 130}, "test_domain")) == 2
+    
+    quality_monitor.add_quality_rule(QualityRule(
+        name="age_range",
+        description="Age range rule",
+        rule_type="range",
+        parameters={"min": 0, "max": 120, "fields": ["age"]},
+        severity="high"
+    ))
+    results = quality_monitor.check_quality({"name": "test", "age": 130}, "test_domain")
+    assert [r.rule_name for r in results] == ["test_rule", "test_rule", "age_range"]
+    
+    quality_monitor.remove_quality_rule(sample_rule.name)
+    results = quality_monitor.check_quality({"name": "test", "age": 130}, "test_domain")
+    assert [r.rule_name for r in results] == ["age_range"]
+
+def test_quality_monitor_metrics_only_check(quality_monitor, sample_rule):
+    """Test that checks can update metrics without returning results."""
+    quality_monitor.add_quality_rule(sample_rule)
+    results = quality_monitor.check_quality({"a": "x", "b": None}, "test_domain", return_results=False)
+    assert results == []
+    report = quality_monitor.get_quality_report("test_domain")
+    assert report["quality_score"] == 50.0
+    assert report["total_checks"] == 2
+
+def test_quality_monitor_duration_buckets(quality_monitor, sample_rule):
+    """Test that check durations use microsecond-scale histogram buckets."""
+    quality_monitor.add_quality_rule(sample_rule)
+    quality_monitor.check_quality({"name": "test"}, "test_domain")
+    bounds = [
+        sample.labels["le"]
+        for family in quality_monitor.quality_check_duration.collect()
+        for sample in family.samples
+        if sample.name.endswith("_bucket")
+    ]
+    count = quality_monitor._sum_samples(
+        quality_monitor.quality_check_duration, "data_quality_check_duration_seconds_count"
+    )
+    assert count == 1
+    assert bounds[0] == "1e-06"
+    assert bounds[-1] == "+Inf"
+    assert len(bounds) == 10
+
+def test_quality_monitor_observe_many_matches_observe():
+    """Test that bulk histogram updates produce the same samples as observe()."""
+    values = [0.0, 5e-7, 1e-6, 3e-5, 1e-3, 0.5, 1.0, 2.0]
+    
+    def samples(hist):
+        return [
+            (sample.name, sample.labels, sample.value)
+            for family in hist.collect()
+            for sample in family.samples
+            if not sample.name.endswith("_created")
+        ]
+    
+    expected = Histogram('h', 'h', ['rule_type'], buckets=(1e-6, 1e-5, 1e-3, 1.0), registry=CollectorRegistry())
+    for value in values:
+        expected.labels(rule_type="range").observe(value)
+    
+    actual = Histogram('h', 'h', ['rule_type'], buckets=(1e-6, 1e-5, 1e-3, 1.0), registry=CollectorRegistry())
+    child = actual.labels(rule_type="range")
+    bucket_counts = [0] * 5
+    for value in values:
+        bucket_counts[QualityMonitor._bucket_index(child, value)] += 1
+    QualityMonitor._observe_many(child, sum(values), bucket_counts)
+    
+    assert samples(actual) == samples(expected)
+
+def test_quality_monitor_rejects_unknown_rule_type(quality_monitor):
+    """Test that rule types outside the supported set are refused."""
+    rule = QualityRule(
+        name="unknown_rule",
+        description="Unknown rule type",
+        rule_type="unknown_type",
+        parameters={},
+        severity="high"
+    )
+    with pytest.raises(ValueError, match="Unknown rule type"):
+        quality_monitor.add_quality_rule(rule)
+
+def test_batch_check_endpoint_respects_rule_fields():
+    """Test that /check/batch only applies field-scoped rules to their columns."""
+    from data_mesh.api.quality_service import app, monitor
+    client = TestClient(app)
+    response = client.post("/rules", json={
+        "name": "batch_age_range",
+        "description": "Age range rule",
+        "rule_type": "range",
+        "parameters": {"min": 0, "max": 120, "fields": ["age"]},
+        "severity": "high"
+    })
+    assert response.status_code == 200
+    try:
+        response = client.post("/check/batch", json={
+            "data": {"name": ["bob", "al"], "age": [130, 5]},
+            "domain": "test_domain"
+        })
+        assert response.status_code == 200
+        results = response.json()
+        assert [(r["column"], r["rule_name"]) for r in results] == [("age", "batch_age_range")]
+        assert results[0]["failed_indices"] == [0]
+    finally:
+        monitor.remove_quality_rule("batch_age_range")
@@ -9,7 +9,9 @@ from data_mesh.quality.quality_service import (
 @pytest.fixture
 def quality_service():
     """Fixture to create a fresh quality service instance for each test."""
-    return DataQualityService()
+    service = DataQualityService()
+    yield service
+    service.close()
 
 @pytest.fixture
 def sample_rule():
@@ -53,6 +55,80 @@ def test_run_quality_check_completeness_fail(quality_service, sample_rule):
     assert "Missing required fields" in results[0].message
     assert "value" in results[0].details["missing_fields"]
 
+def test_run_quality_check_multiple_rules(quality_service, sample_rule):
+    """Test that parallel rule execution keeps results in rule order."""
+    quality_service.add_rule(sample_rule)
+    for rule_type in ["accuracy", "consistency", "timeliness"]:
+        quality_service.add_rule(QualityRule(
+            name=f"test_{rule_type}",
+            description=f"Test {rule_type} rule",
+            rule_type=rule_type,
+            parameters={},
+            severity="warning"
+        ))
+    
+    results = quality_service.run_quality_check({"id": 1, "name": "test"})
+    assert [r.rule_name for r in results] == list(quality_service.rules)
+    assert not results[0].passed
+    assert all(r.passed for r in results[1:])
+    assert all(len(quality_service.get_check_history(name)) == 1 for name in quality_service.rules)
+
+def test_run_quality_check_after_close(quality_service, sample_rule):
+    """Test that a closed service starts a new worker pool when used again."""
+    quality_service.add_rule(sample_rule)
+    quality_service.add_rule(QualityRule(
+        name="test_accuracy",
+        description="Test accuracy rule",
+        rule_type="accuracy",
+        parameters={},
+        severity="warning"
+    ))
+    quality_service.close()
+    results = quality_service.run_quality_check({"id": 1, "name": "test", "value": 100})
+    assert all(r.passed for r in results)
+
+def test_completeness_reports_missing_fields_in_order(quality_service, sample_rule):
+    """Test that missing fields are reported in the order the rule lists them."""
+    quality_service.add_rule(sample_rule)
+    results = quality_service.run_quality_check({"name": "test"})
+    assert not results[0].passed
+    assert results[0].details == {"missing_fields": ["id", "value"]}
+    assert sample_rule._executor is not None
+    assert "_executor" not in sample_rule.model_dump()
+
+def test_run_quality_check_batch(quality_service, sample_rule):
+    """Test that batch checks report one failure per incomplete record."""
+    quality_service.add_rule(sample_rule)
+    records = [
+        {"id": 1, "name": "a", "value": 10},
+        {"id": 2, "name": None, "value": 20},
+        {"id": 3, "value": 30},
+    ]
+    failures = quality_service.run_quality_check_batch(records)
+    assert [f.details for f in failures] == [
+        {"row": 1, "missing_fields": ["name"]},
+        {"row": 2, "missing_fields": ["name"]},
+    ]
+    assert all(not f.passed for f in failures)
+    assert quality_service.get_check_history(sample_rule.name) == []
+
+def test_run_quality_check_named_rule(quality_service, sample_rule):
+    """Test running a single rule by name, including unknown and disabled rules."""
+    quality_service.add_rule(sample_rule)
+    results = quality_service.run_quality_check({"id": 1}, rule_name="missing_rule")
+    assert len(results) == 1
+    assert not results[0].passed
+    assert results[0].message == "Rule not found"
+    
+    # An empty name runs every enabled rule, as if none were given
+    results = quality_service.run_quality_check({"id": 1}, rule_name="")
+    assert [result.rule_name for result in results] == [sample_rule.name]
+    
+    sample_rule.enabled = False
+    assert quality_service.run_quality_check({"id": 1}, rule_name=sample_rule.name) == []
+    assert quality_service.run_quality_check({"id": 1}) == []
+    assert quality_service.get_quality_metrics()["active_rules"] == 0
+
 def test_get_check_history(quality_service, sample_rule):
     """Test retrieving check history."""
     quality_service.add_rule(sample_rule)
@@ -61,6 +137,19 @@ def test_get_check_history(quality_service, sample_rule):
     history = quality_service.get_check_history(sample_rule.name)
     assert len(history) == 1
     assert isinstance(history[0], QualityCheck)
+    records = quality_service.get_check_records(sample_rule.name)
+    assert [record.to_model(QualityCheck) for record in records] == history
+
+def test_check_result_converts_to_api_model(quality_service, sample_rule):
+    """Test that internal check records convert to the QualityCheck API model."""
+    quality_service.add_rule(sample_rule)
+    result = quality_service.run_quality_check({"id": 1, "name": "test", "value": 100})[0]
+    check = result.to_model(QualityCheck)
+    assert isinstance(check, QualityCheck)
+    assert check.rule_name == result.rule_name
+    assert isinstance(result.timestamp, int)
+    assert check.timestamp.isoformat() == result.timestamp_iso
+    assert result.to_dict() == {**check.model_dump(), "timestamp": result.timestamp_iso}
 
 def test_get_quality_metrics(quality_service, sample_rule):
     """Test retrieving quality metrics."""
@@ -73,6 +162,24 @@ def test_get_quality_metrics(quality_service, sample_rule):
     assert metrics["pass_rate"] == 100.0
     assert metrics["active_rules"] == 1
 
+def test_check_history_is_bounded(sample_rule):
+    """Test that history evicts old checks and metrics track only retained checks."""
+    service = DataQualityService(history_size=2)
+    service.add_rule(sample_rule)
+    service.run_quality_check({"id": 1})
+    service.run_quality_check({"id": 1, "name": "test", "value": 100})
+    service.run_quality_check({"id": 1, "name": "test", "value": 100})
+    assert len(service.get_check_history(sample_rule.name)) == 2
+    metrics = service.get_quality_metrics()
+    assert metrics["total_checks"] == 2
+    assert metrics["passed_checks"] == 2
+    service.close()
+
+def test_history_size_must_be_positive():
+    """Test that a history size below one is rejected."""
+    with pytest.raises(ValueError, match="history_size"):
+        DataQualityService(history_size=0)
+
 def test_unknown_rule_type(quality_service):
     """Test handling of unknown rule type."""
     rule = QualityRule(